@@ -5,7 +5,11 @@ from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import plotly.express as px
 
-from comment_analysis import generate_comment_analysis
+import joblib
+from scipy import sparse
+
+from comment_analysis import generate_comment_analysis, TFIDF_MATRIX_PATH, VECTORIZER_PATH
+from similarity_index import build_similarity_index, query_similar, similar_to_row
 
 st.set_page_config(
     page_title="Corrections Den",
@@ -116,6 +120,7 @@ if data_is_stale(DATA_PATH, MAX_AGE_DAYS):
         generate_comment_analysis()
 
     st.cache_data.clear()
+    st.cache_resource.clear()
 
 
 # Sidebar
@@ -126,6 +131,7 @@ with st.sidebar:
         with st.spinner("Fetching new comments from YouTube. This may take up to ten minutes."):
             generate_comment_analysis(force_refresh=True)
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.success("Data refreshed. Reload the page.")
 
 
@@ -292,3 +298,77 @@ if (end_date >= strike_start.date()) and (start_date <= strike_end.date()):
     )
 
 st.plotly_chart(fig, use_container_width=True)
+
+
+# Similar comments lookup (index over the TF-IDF matrix saved by comment_analysis.py)
+@st.cache_resource(ttl=604800)
+def load_similarity_index():
+    if not (os.path.exists(TFIDF_MATRIX_PATH) and os.path.exists(VECTORIZER_PATH)):
+        return None, None
+    X = sparse.load_npz(TFIDF_MATRIX_PATH)
+    # Rows must line up with the processed comments
+    if X.shape[0] != len(load_cached_comments()):
+        return None, None
+    return joblib.load(VECTORIZER_PATH), build_similarity_index(X)
+
+# Centroid-nearest comments saved by comment_analysis.py
+@st.cache_data(ttl=604800)
+def load_cluster_exemplars():
+    path = "data/processed/cluster_exemplars.csv"
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path)
+
+with st.spinner("Loading similar-comments index..."):
+    vectorizer, similarity_index = load_similarity_index()
+topic_names = dict(zip(labels_df["cluster"], labels_df["topic_label"]))
+
+
+def show_similar(rows, scores):
+    results = df.iloc[rows][["comment", "like_count", "cluster"]].copy()
+    results["topic_label"] = results["cluster"].map(topic_names)
+    results["similarity"] = scores.round(3)
+    st.dataframe(
+        results.drop(columns="cluster"),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+st.subheader("Find Similar Comments")
+
+query_text = st.text_input("Type a comment or phrase")
+top_k = st.slider("Number of results", min_value=1, max_value=25, value=10)
+
+if similarity_index is None:
+    st.info("Similar-comments index not found. Refresh data in the sidebar.")
+elif query_text.strip():
+    rows, scores = query_similar(similarity_index, vectorizer.transform([query_text]), k=top_k)
+    if len(rows) == 0:
+        st.info("No similar comments found. Try different wording.")
+    else:
+        show_similar(rows, scores)
+
+        # Pivot from one of the results to the comments most similar to it
+        selected = st.selectbox(
+            "Show comments similar to",
+            rows.tolist(),
+            format_func=lambda row: str(df["comment"].iloc[row])[:120]
+        )
+        similar_rows, similar_scores = similar_to_row(similarity_index, selected, k=top_k)
+        if len(similar_rows) == 0:
+            st.info("No similar comments found for this comment.")
+        else:
+            show_similar(similar_rows, similar_scores)
+
+exemplars_df = load_cluster_exemplars()
+
+with st.expander("Representative comments per topic"):
+    st.caption("Comments nearest each topic's K-means centroid.")
+    if exemplars_df is None:
+        st.info("Representative comments not found. Refresh data in the sidebar.")
+    else:
+        for cluster_id, group in exemplars_df.sort_values(["cluster", "rank"]).groupby("cluster"):
+            st.markdown(f"**{topic_names.get(cluster_id, cluster_id)}**")
+            for comment in group["comment"]:
+                st.markdown(f"- {str(comment)[:200]}")
@@ -0,0 +1,122 @@
+import sys
+import time
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from similarity_index import build_similarity_index, similar_to_row, _candidates
+
+# Checks the similar-comments index against brute-force cosine on fixed
+# synthetic corpora: recall@k, fraction of rows re-ranked, and median latency.
+
+MIN_RECALL = 0.9
+MAX_CANDIDATE_FRACTION = 0.1
+MAX_POSTINGS = 1000
+
+
+# Synthetic corpora
+def topic_corpus(n_docs=20000, n_topics=40, seed=0):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(3000)])
+    topic_words = [rng.choice(len(vocab), 40, replace=False) for _ in range(n_topics)]
+
+    docs = []
+    for _ in range(n_docs):
+        words = rng.choice(topic_words[rng.integers(n_topics)], rng.integers(4, 15))
+        noise = rng.choice(len(vocab), rng.integers(0, 4))
+        docs.append(" ".join(vocab[np.concatenate([words, noise])]))
+    return TfidfVectorizer().fit_transform(docs)
+
+
+def skewed_corpus(n_docs=60000, n_topics=200, vocab_size=20000, seed=1):
+    # Short comments with Zipf-like word frequencies, so some postings are long
+    rng = np.random.default_rng(seed)
+    freq = 1 / np.arange(1, vocab_size + 1) ** 1.1
+    freq /= freq.sum()
+    topic_words = [rng.choice(vocab_size, 60, replace=False, p=freq) for _ in range(n_topics)]
+
+    docs = []
+    for _ in range(n_docs):
+        length = rng.integers(3, 12)
+        n_topic = rng.binomial(length, 0.5)
+        words = np.concatenate([
+            rng.choice(topic_words[rng.integers(n_topics)], n_topic),
+            rng.choice(vocab_size, length - n_topic, p=freq)
+        ])
+        docs.append(" ".join(f"w{i}" for i in words))
+    return TfidfVectorizer(min_df=2, max_df=0.9).fit_transform(docs)
+
+
+# Evaluation
+def evaluate(name, X, k=10, n_queries=300, seed=0):
+    index = build_similarity_index(X)
+    X = X.tocsr()
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(X.shape[0], n_queries, replace=False)
+
+    recalls, fractions = [], []
+    index_times, sparse_times, dense_times = [], [], []
+    for row in rows:
+        start = time.perf_counter()
+        found, _ = similar_to_row(index, row, k=k, max_postings=MAX_POSTINGS)
+        index_times.append(time.perf_counter() - start)
+
+        # Brute force: sparse-sparse product over every row
+        start = time.perf_counter()
+        exact = (X @ X[row].T).toarray().ravel()
+        sparse_times.append(time.perf_counter() - start)
+
+        # Brute force: CSR times dense vector over every row
+        start = time.perf_counter()
+        X @ X[row].toarray().ravel()
+        dense_times.append(time.perf_counter() - start)
+
+        exact[row] = -1
+        truth = np.argsort(exact)[::-1][:k]
+        truth = truth[exact[truth] > 0]
+        if len(truth):
+            recalls.append(len(set(found) & set(truth)) / len(truth))
+
+        terms = index["row_terms"][index["row_ptr"][row]:index["row_ptr"][row + 1]]
+        if len(terms):
+            fractions.append(_candidates(index, terms, MAX_POSTINGS).sum() / X.shape[0])
+
+    result = {
+        "recall": float(np.mean(recalls)),
+        "candidate_fraction": float(np.mean(fractions)),
+        "index_ms": float(np.median(index_times) * 1e3),
+        "brute_sparse_ms": float(np.median(sparse_times) * 1e3),
+        "brute_dense_ms": float(np.median(dense_times) * 1e3),
+    }
+    print(
+        f"{name} ({X.shape[0]:,} docs): recall@{k} {result['recall']:.3f}, "
+        f"candidates {result['candidate_fraction']:.1%} of rows, "
+        f"index {result['index_ms']:.2f} ms vs brute force "
+        f"{result['brute_sparse_ms']:.2f} ms (sparse) / {result['brute_dense_ms']:.2f} ms (dense vector)"
+    )
+    return result
+
+
+def check(result):
+    failures = []
+    if result["recall"] < MIN_RECALL:
+        failures.append(f"recall {result['recall']:.3f} below {MIN_RECALL}")
+    if result["candidate_fraction"] > MAX_CANDIDATE_FRACTION:
+        failures.append(f"candidate fraction {result['candidate_fraction']:.1%} above {MAX_CANDIDATE_FRACTION:.0%}")
+    brute_ms = min(result["brute_sparse_ms"], result["brute_dense_ms"])
+    if result["index_ms"] >= brute_ms:
+        failures.append(f"index query {result['index_ms']:.2f} ms is not faster than brute force {brute_ms:.2f} ms")
+    return failures
+
+
+def main():
+    failures = []
+    for name, corpus in [("topic corpus", topic_corpus), ("skewed corpus", skewed_corpus)]:
+        failures += [f"{name}: {f}" for f in check(evaluate(name, corpus()))]
+
+    if failures:
+        sys.exit("\n".join(failures))
+    print("All similarity index checks passed.")
+
+
+if __name__ == "__main__":
+    main()
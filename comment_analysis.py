@@ -6,6 +6,8 @@ from tqdm import tqdm
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
 import numpy as np
+import joblib
+from scipy import sparse
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 
 # Load environment
@@ -20,6 +22,8 @@ youtube = build("youtube", "v3", developerKey=API_KEY)
 
 RAW_CACHE_PATH = "data/raw/corrections_comments_raw.csv"
 PROCESSED_PATH = "data/processed/corrections_comments.csv"
+TFIDF_MATRIX_PATH = "data/processed/tfidf_matrix.npz"
+VECTORIZER_PATH = "data/processed/tfidf_vectorizer.joblib"
 
 # YouTube helper functions
 def get_upload_playlist_id(channel_id: str) -> str:
@@ -86,12 +90,15 @@ def get_video_comments(video_id: str, max_comments=500) -> pd.DataFrame:
     return pd.DataFrame(comments)
 
 # Clustering
-def cluster_comments(comments: pd.Series, n_clusters=5):
-
+def make_vectorizer():
     custom_stopwords = {"like", "just", "love", "don", "know", "did", "say", "seth", "corrections", "correction", "ve", "really", "best"}
     all_stopwords = list(ENGLISH_STOP_WORDS.union(custom_stopwords))
-    
-    vectorizer = TfidfVectorizer(stop_words=all_stopwords, max_df=0.9, min_df=10)
+
+    return TfidfVectorizer(stop_words=all_stopwords, max_df=0.9, min_df=10)
+
+
+def cluster_comments(comments: pd.Series, n_clusters=5):
+    vectorizer = make_vectorizer()
     X = vectorizer.fit_transform(comments)
 
     kmeans = KMeans(n_clusters=n_clusters, random_state=42)
@@ -100,7 +107,23 @@ def cluster_comments(comments: pd.Series, n_clusters=5):
     return labels, vectorizer, kmeans, X
 
 
-def summarize_clusters(df, vectorizer, kmeans, X, n_terms=10, n_examples=5):
+def get_cluster_exemplars(df, kmeans, X, n_examples=5):
+    """
+    Exact nearest members to each KMeans centroid, as {cluster_id: [row positions]}.
+    """
+    distances = kmeans.transform(X)
+    labels = df["cluster"].to_numpy()
+
+    exemplars = {}
+    for cluster_id in range(kmeans.n_clusters):
+        members = np.flatnonzero(labels == cluster_id)
+        nearest = members[np.argsort(distances[members, cluster_id])[:n_examples]]
+        exemplars[cluster_id] = nearest.tolist()
+
+    return exemplars
+
+
+def summarize_clusters(df, vectorizer, kmeans, exemplars, n_terms=10):
     feature_names = np.array(vectorizer.get_feature_names_out())
     print("\n=== CLUSTER SUMMARIES ===\n")
 
@@ -112,8 +135,8 @@ def summarize_clusters(df, vectorizer, kmeans, X, n_terms=10, n_examples=5):
         print("Top terms:")
         print(", ".join(top_terms))
 
-        examples = df[df["cluster"] == cluster_id]["comment"].head(n_examples)
-        print("\nExample comments:")
+        examples = df["comment"].iloc[exemplars[cluster_id]]
+        print("\nRepresentative comments:")
         for c in examples:
             print(f"  - {c[:200]}")
 
@@ -197,8 +220,21 @@ def generate_comment_analysis(force_refresh=False):
 
     label_df.to_csv("data/processed/cluster_labels.csv", index=False)
 
+    # Comments nearest each centroid, shown as representative comments in the app
+    exemplars = get_cluster_exemplars(comments_df, kmeans, X)
+    exemplar_df = pd.DataFrame([
+        {"cluster": cluster_id, "rank": rank, "comment": comments_df["comment"].iloc[row]}
+        for cluster_id, rows in exemplars.items()
+        for rank, row in enumerate(rows, start=1)
+    ])
+    exemplar_df.to_csv("data/processed/cluster_exemplars.csv", index=False)
+
     # Summarize
-    summarize_clusters(comments_df, vectorizer, kmeans, X)
+    summarize_clusters(comments_df, vectorizer, kmeans, exemplars)
+
+    # Save the clustered TF-IDF matrix and vectorizer for the app's similar-comments search
+    sparse.save_npz(TFIDF_MATRIX_PATH, X)
+    joblib.dump(vectorizer, VECTORIZER_PATH)
 
     # Save processed comments
     comments_df.to_csv(PROCESSED_PATH, index=False)
@@ -0,0 +1,121 @@
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+
+# Approximate nearest-neighbour lookup over TF-IDF comment vectors
+# (comment_analysis.py). Each term keeps a posting list of the comments that
+# use it; a query gathers candidates from the postings of its rarest terms,
+# up to a budget, and re-ranks only those by exact cosine similarity instead
+# of scanning the whole matrix. Comments are short, so a comment's nearest
+# neighbours almost always share its rarest terms.
+
+def _gather(indptr, keys):
+    # Positions of every entry in the CSR/CSC slices `keys`, concatenated
+    starts = indptr[keys]
+    sizes = indptr[keys + 1] - starts
+    ends = np.cumsum(sizes)
+    positions = np.repeat(starts - (ends - sizes), sizes) + np.arange(ends[-1] if len(ends) else 0)
+    return positions, sizes, ends
+
+
+def _as_query_terms(query):
+    if sparse.issparse(query):
+        query = sparse.csr_matrix(query)
+        terms, weights = query.indices, query.data.astype(np.float32)
+    else:
+        query = np.asarray(query, dtype=np.float32).ravel()
+        terms = np.flatnonzero(query)
+        weights = query[terms]
+    norm = np.sqrt(weights @ weights)
+    if norm == 0:
+        return None, None
+    return terms, weights / norm
+
+
+def _empty_result():
+    return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+
+# Build index
+def build_similarity_index(X):
+    """
+    Rows are L2-normalized, so re-ranking scores are cosine similarities.
+    All-zero rows (e.g. stopword-only comments) have no postings and are never returned.
+    """
+    if not sparse.issparse(X):
+        raise TypeError("build_similarity_index expects a sparse TF-IDF matrix.")
+
+    rows = normalize(sparse.csr_matrix(X, dtype=np.float32))
+    columns = rows.tocsc()
+
+    return {
+        "n_rows": rows.shape[0],
+        "n_terms": rows.shape[1],
+        "row_ptr": rows.indptr,
+        "row_terms": rows.indices,
+        "row_weights": rows.data,
+        "posting_ptr": columns.indptr,
+        "postings": columns.indices,
+        "doc_freq": np.diff(columns.indptr),
+    }
+
+
+def _candidates(index, terms, max_postings):
+    # Rarest terms first; the rarest one is always used even if over budget
+    doc_freq = index["doc_freq"][terms]
+    order = np.argsort(doc_freq, kind="stable")
+    sizes = doc_freq[order]
+    keep = np.cumsum(sizes) - sizes < max_postings
+    keep[0] = True
+
+    positions, _, _ = _gather(index["posting_ptr"], terms[order][keep])
+    seen = np.zeros(index["n_rows"], dtype=bool)
+    seen[index["postings"][positions]] = True
+    return seen
+
+
+def _rerank(index, terms, weights, candidates, k):
+    dense_query = np.zeros(index["n_terms"], dtype=np.float32)
+    dense_query[terms] = weights
+
+    positions, sizes, ends = _gather(index["row_ptr"], candidates)
+    products = index["row_weights"][positions] * dense_query[index["row_terms"][positions]]
+    scores = np.add.reduceat(products, ends - sizes)
+
+    top = np.argpartition(-scores, k)[:k] if len(scores) > k else np.arange(len(scores))
+    top = top[np.argsort(-scores[top])]
+    top = top[scores[top] > 0]
+    return candidates[top], scores[top]
+
+
+def _search(index, terms, weights, k, exclude, max_postings):
+    seen = _candidates(index, terms, max_postings)
+    if exclude is not None:
+        seen[exclude] = False
+    candidates = np.flatnonzero(seen)
+    if len(candidates) == 0:
+        return _empty_result()
+    return _rerank(index, terms, weights, candidates, k)
+
+
+# Query
+def query_similar(index, query, k=5, exclude=None, max_postings=1000):
+    """
+    Returns (row_ids, cosine_scores) for the top-k rows most similar to `query`.
+    Candidates come from the postings of the query's rarest terms until
+    `max_postings` entries have been gathered.
+    """
+    terms, weights = _as_query_terms(query)
+    if terms is None:
+        return _empty_result()
+    return _search(index, terms, weights, k, exclude, max_postings)
+
+
+def similar_to_row(index, row, k=5, max_postings=1000):
+    start, end = index["row_ptr"][row], index["row_ptr"][row + 1]
+    if start == end:
+        return _empty_result()
+    terms = index["row_terms"][start:end]
+    weights = index["row_weights"][start:end]
+    return _search(index, terms, weights, k, row, max_postings)
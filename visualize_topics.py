@@ -39,7 +39,7 @@ def cluster_comments(df, n_clusters=6):
     return df, kmeans, embeddings
 
 # Identify top keywords and example comments per cluster (using tf-idf)
-def get_top_keywords_per_cluster(df, n_clusters, top_n=8, n_examples=3):
+def get_top_keywords_per_cluster(df, n_clusters, top_n=8, n_examples=3, embeddings=None, kmeans=None):
     df = df.reset_index(drop=True)
 
     extra_stops = {
@@ -58,6 +58,11 @@ def get_top_keywords_per_cluster(df, n_clusters, top_n=8, n_examples=3):
     tfidf_matrix = vectorizer.fit_transform(df["clean_comment"].fillna(""))
     feature_names = np.array(vectorizer.get_feature_names_out())
 
+    # Exact distances to each centroid when the embeddings and model are available
+    distances = None
+    if embeddings is not None and kmeans is not None:
+        distances = kmeans.transform(embeddings)
+
     cluster_summaries = {}
     for i in range(n_clusters):
         cluster_docs = df[df["cluster"] == i]
@@ -70,10 +75,16 @@ def get_top_keywords_per_cluster(df, n_clusters, top_n=8, n_examples=3):
         top_indices = np.argsort(mean_tfidf.A1)[-top_n:][::-1]
         top_words = feature_names[top_indices].tolist()
 
-        # random sample of representative comments
-        examples = cluster_docs["clean_comment"].sample(
-            min(n_examples, len(cluster_docs)), random_state=42
-        ).tolist()
+        if distances is not None:
+            # comments nearest the cluster centroid
+            members = cluster_docs.index.to_numpy()
+            nearest = members[np.argsort(distances[members, i])[:n_examples]]
+            examples = df["clean_comment"].iloc[nearest].tolist()
+        else:
+            # random sample of representative comments
+            examples = cluster_docs["clean_comment"].sample(
+                min(n_examples, len(cluster_docs)), random_state=42
+            ).tolist()
 
         cluster_summaries[i] = {"keywords": top_words, "examples": examples}
 
@@ -136,7 +147,9 @@ def main():
     df, kmeans, embeddings = cluster_comments(df, n_clusters=6)
     
     # Get top keywords per cluster
-    cluster_keywords = get_top_keywords_per_cluster(df, n_clusters=6)
+    cluster_keywords = get_top_keywords_per_cluster(
+        df, n_clusters=6, embeddings=embeddings, kmeans=kmeans
+    )
     for i, words in cluster_keywords.items():
         print(f"Cluster {i}: {', '.join(words)}")
     